@@ -57,6 +57,9 @@ class TestFixture(object):
   DEPS = []
   PROVIDES = []
   REQUIRES = []
+  # Set to False if the queued messages don't need to be flushed before this
+  # test runs, provided no earlier test has sent a SET since the last flush.
+  FLUSH_QUEUE = True
 
   def __init__(self, device, universe, uid, pid_store, *args, **kwargs):
     self._warnings = []
@@ -127,6 +130,10 @@ class TestFixture(object):
     """Returns a list of the properties this test requires to run."""
     return self.REQUIRES
 
+  def ModifiedState(self):
+    """Returns True if this test may have changed the state of the responder."""
+    return False
+
   @property
   def category(self):
     """The category this test belongs to."""
@@ -286,6 +293,8 @@ class ResponderTestFixture(TestFixture):
     # a message. It's used to identify the response if we get an ACK_TIMER and
     # use QUEUED_MESSAGEs
     self._outstanding_request = None
+    # Set to True once we send a SET
+    self._sent_set = False
 
   @property
   def uid(self):
@@ -295,6 +304,9 @@ class ResponderTestFixture(TestFixture):
     # By default all PIDs are supported, overridden in subclasses
     return True
 
+  def ModifiedState(self):
+    return self._sent_set
+
   def SleepAfterBroadcastSet(self):
     if self._broadcast_write_delay_s:
       self.LogDebug('Sleeping after broadcast...')
@@ -582,6 +594,8 @@ class ResponderTestFixture(TestFixture):
     # from the root.
     if sub_device == PidStore.ALL_SUB_DEVICES:
       sub_device = PidStore.ROOT_DEVICE
+    if command_class == PidStore.RDM_SET:
+      self._sent_set = True
     self._outstanding_request = (sub_device, command_class, pid)
 
   def _HandleQueuedResponse(self, response, unpacked_data, unpack_exception):
@@ -686,7 +700,7 @@ class ResponderTestFixture(TestFixture):
       return [self._EscapeData(i) for i in data]
     elif type(data) == dict:
       d = {}
-      for k, v in data.iteritems():
+      for k, v in data.items():
         d[k] = self._EscapeData(v)
       return d
     elif type(data) == str:
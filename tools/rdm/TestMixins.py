@@ -42,10 +42,13 @@ MAX_DMX_ADDRESS = DMX_UNIVERSE_SIZE
 
 
 # Generic GET Mixins
-# These don't care about the format of the message.
+# These don't care about the format of the message. They only send GETs, so
+# they don't need the queued messages flushed unless an earlier test sent a
+# SET.
 # -----------------------------------------------------------------------------
 class UnsupportedGetMixin(ResponderTestFixture):
   """Check that Get fails with NR_UNSUPPORTED_COMMAND_CLASS."""
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
 
   def Test(self):
@@ -58,6 +61,7 @@ class UnsupportedGetWithDataMixin(ResponderTestFixture):
   """Check that GET with random param data fails with
     NR_UNSUPPORTED_COMMAND_CLASS.
   """
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
   DATA = 'foo'
 
@@ -71,6 +75,7 @@ class AllSubDevicesUnsupportedGetMixin(ResponderTestFixture):
   """Check that a GET to ALL_SUB_DEVICES fails with
     NR_UNSUPPORTED_COMMAND_CLASS.
   """
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
 
   def Test(self):
@@ -94,6 +99,7 @@ class GetMixin(ResponderTestFixture):
     If ALLOWED_NACKS is non-empty, this adds a custom NackGetResult to the list
     of allowed results for each entry.
   """
+  FLUSH_QUEUE = False
   ALLOWED_NACKS = []
   EXPECTED_FIELDS = None
 
@@ -111,7 +117,7 @@ class GetMixin(ResponderTestFixture):
 
   def VerifyResult(self, response, fields):
     if response.WasAcked() and self.PROVIDES:
-      for i in xrange(0, min(len(self.PROVIDES), len(self.EXPECTED_FIELDS))):
+      for i in range(0, min(len(self.PROVIDES), len(self.EXPECTED_FIELDS))):
         self.SetProperty(self.PROVIDES[i], fields[self.EXPECTED_FIELDS[i]])
 
 
@@ -159,6 +165,7 @@ class GetRequiredMixin(ResponderTestFixture):
     This mixin also sets a property if PROVIDES is defined.  The target class
     needs to defined EXPECTED_FIELDS and optionally PROVIDES.
   """
+  FLUSH_QUEUE = False
   EXPECTED_FIELDS = None
 
   def Test(self):
@@ -173,7 +180,7 @@ class GetRequiredMixin(ResponderTestFixture):
 
   def VerifyResult(self, response, fields):
     if response.WasAcked() and self.PROVIDES:
-      for i in xrange(0, min(len(self.PROVIDES), len(self.EXPECTED_FIELDS))):
+      for i in range(0, min(len(self.PROVIDES), len(self.EXPECTED_FIELDS))):
         self.SetProperty(self.PROVIDES[i], fields[self.EXPECTED_FIELDS[i]])
 
 
@@ -194,7 +201,7 @@ class GetRequiredStringMixin(GetRequiredMixin):
     string_field = fields[self.EXPECTED_FIELDS[0]]
 
     if self.PROVIDES:
-      for i in xrange(0, min(len(self.PROVIDES), len(self.EXPECTED_FIELDS))):
+      for i in range(0, min(len(self.PROVIDES), len(self.EXPECTED_FIELDS))):
         self.SetProperty(self.PROVIDES[i], fields[self.EXPECTED_FIELDS[i]])
 
     if ContainsUnprintable(string_field):
@@ -222,6 +229,7 @@ class GetWithDataMixin(ResponderTestFixture):
     If ALLOWED_NACKS is non-empty, this adds a custom NackGetResult to the list
     of allowed results for each entry.
   """
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
   DATA = 'foo'
   ALLOWED_NACKS = []
@@ -240,6 +248,7 @@ class GetWithDataMixin(ResponderTestFixture):
 
 class GetMandatoryPIDWithDataMixin(ResponderTestFixture):
   """GET a mandatory PID with junk param data."""
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
   DATA = 'foo'
 
@@ -256,6 +265,7 @@ class GetMandatoryPIDWithDataMixin(ResponderTestFixture):
 
 class GetWithNoDataMixin(ResponderTestFixture):
   """GET with no data, expect NR_FORMAT_ERROR."""
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
 
   def Test(self):
@@ -265,6 +275,7 @@ class GetWithNoDataMixin(ResponderTestFixture):
 
 class AllSubDevicesGetMixin(ResponderTestFixture):
   """Send a GET to ALL_SUB_DEVICES."""
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.SUB_DEVICES
   DATA = []
 
@@ -360,7 +371,7 @@ class SetLabelMixin(ResponderTestFixture):
   TEST_LABEL = 'test label'
   PROVIDES = []
 
-  SET, VERIFY, RESET = xrange(3)
+  SET, VERIFY, RESET = range(3)
 
   def OldValue(self):
     self.SetBroken('Base OldValue method of SetLabelMixin called')
@@ -574,7 +585,7 @@ class SetUInt32Mixin(SetMixin):
 # -----------------------------------------------------------------------------
 class SetDMXStartAddressMixin(ResponderTestFixture):
   """Set the dmx start address."""
-  SET, VERIFY, RESET = xrange(3)
+  SET, VERIFY, RESET = range(3)
   start_address = 1
 
   def CalculateNewAddress(self, current_address, footprint):
@@ -714,7 +725,7 @@ class SetUndefinedSensorValues(ResponderTestFixture):
   def Test(self):
     sensors = self.Property('sensor_definitions')
     self._missing_sensors = []
-    for i in xrange(0, 0xff):
+    for i in range(0, 0xff):
       if i not in sensors:
         self._missing_sensors.append(i)
 
@@ -1022,6 +1033,7 @@ class SetMinimumLevelMixin(ResponderTestFixture):
 
 class GetZeroMixin(ResponderTestFixture):
   """Send a get to index 0, expect NR_DATA_OUT_OF_RANGE"""
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
   DATA = None
 
@@ -1080,6 +1092,7 @@ class SetZeroUInt32Mixin(SetZeroMixin):
 
 class GetOutOfRangeUInt8Mixin(ResponderTestFixture):
   """The subclass provides the NumberOfSettings() method."""
+  FLUSH_QUEUE = False
   CATEGORY = TestCategory.ERROR_CONDITIONS
   LABEL = None
 
@@ -1149,6 +1162,7 @@ class GetSettingDescriptionsMixin(ResponderTestFixture):
     If ALLOWED_NACKS is non-empty, this adds a custom NackGetResult to the list
     of allowed results for each entry.
   """
+  FLUSH_QUEUE = False
   ALLOWED_NACKS = []
   FIRST_INDEX_OFFSET = 1
   EXPECTED_FIELDS = None
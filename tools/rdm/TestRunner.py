@@ -15,19 +15,40 @@
 # TestRunner.py
 # Copyright (C) 2011 Simon Newton
 
+import collections
 import datetime
 import inspect
 import logging
 import time
+import ResponderTest
 from TestState import TestState
 from TimingStats import TimingStats
 from ola import PidStore
 from ola.OlaClient import OlaClient, RDMNack
 from ola.RDMAPI import RDMAPI
-from ola.testing.rdm import ResponderTest
 
 __author__ = 'nomis52@gmail.com (Simon Newton)'
 
+# maps PID names to the Pid objects from the PidStore
+_pid_cache = {}
+
+
+def _GetPid(name):
+  """Look up a PID by name, caching the result.
+
+  Args:
+    name: The name of the PID, e.g. 'QUEUED_MESSAGE'
+
+  Returns:
+    A Pid object, or None if no PID was found.
+  """
+  pid = _pid_cache.get(name)
+  if pid is None:
+    pid = PidStore.GetStore().GetName(name)
+    if pid is not None:
+      _pid_cache[name] = pid
+  return pid
+
 
 class Error(Exception):
   """The base error class."""
@@ -51,6 +72,8 @@ class CircularDependencyException(Error):
 
 class DeviceProperties(object):
   """Encapsulates the properties of a device."""
+  __slots__ = ('_property_names', '_properties')
+
   def __init__(self, property_names):
     object.__setattr__(self, '_property_names', property_names)
     object.__setattr__(self, '_properties', {})
@@ -62,13 +85,17 @@ class DeviceProperties(object):
     return self._properties
 
   def __getattr__(self, property):
-    if property not in self._properties:
+    try:
+      return self._properties[property]
+    except KeyError:
       raise AttributeError(property)
-    return self._properties[property]
 
   def __setattr__(self, property, value):
+    if property in DeviceProperties.__slots__:
+      object.__setattr__(self, property, value)
+      return
     if property in self._properties:
-      logging.warning('Multiple sets of property %s' % property)
+      logging.warning('Multiple sets of property %s', property)
     self._properties[property] = value
 
   def AsDict(self):
@@ -95,7 +122,8 @@ class QueuedMessageFetcher(object):
     There is the Proxied Device Flag in the Control field of the discovery
     messages but many implementations don't expose these to the application.
   """
-  def __init__(self, universe, uid, rdm_api, wrapper, limit=25):
+  def __init__(self, universe, uid, rdm_api, wrapper, limit=25,
+               pipeline_depth=4):
     self._universe = universe
     self._uid = uid
     self._api = rdm_api
@@ -104,50 +132,86 @@ class QueuedMessageFetcher(object):
     self._limit = limit
     self._counter = 0
     self._outstanding_ack_timers = 0
+    # the max number of Get QUEUED_MESSAGE requests to have in flight
+    self._pipeline_depth = pipeline_depth
+    self._in_flight = 0
+    # set after an error or hitting the limit, no more requests are sent
+    self._failed = False
 
-    store = PidStore.GetStore()
-    self._queued_message_pid = store.GetName('QUEUED_MESSAGE')
-    self._status_messages_pid = store.GetName('STATUS_MESSAGES')
+    self._queued_message_pid = _GetPid('QUEUED_MESSAGE')
+    self._status_messages_pid = _GetPid('STATUS_MESSAGES')
 
   def FetchAllMessages(self):
     self._counter = 0
+    self._in_flight = 0
+    self._failed = False
+    # The queue is usually empty, so start with a single request and only
+    # pipeline once a response tells us more messages are waiting.
     if self._FetchQueuedMessage():
       self._wrapper.Run()
 
+  def _FillPipeline(self, queued_messages):
+    """Send enough Get QUEUED_MESSAGE requests to cover the waiting messages.
+
+    Args:
+      queued_messages: The number of messages the responder says are waiting.
+    """
+    target = min(self._pipeline_depth, queued_messages)
+    if self._in_flight == 0:
+      # keep going until we get an empty status message
+      target = max(target, 1)
+    while self._in_flight < target:
+      if not self._FetchQueuedMessage():
+        break
+
   def _FetchQueuedMessage(self):
+    if self._failed:
+      return False
+
     if self._counter == self._limit:
-      logging.error('Queued message hit loop limit of %d' % self._counter)
-      self._wrapper.Stop()
-      return
+      logging.error('Queued message hit loop limit of %d', self._counter)
+      self._failed = True
+      return False
 
     self._counter += 1
-    return self._api.Get(self._universe,
+    sent = self._api.Get(self._universe,
                          self._uid,
                          PidStore.ROOT_DEVICE,  # always sent to the ROOT_DEVICE
                          self._queued_message_pid,
                          self._HandleResponse,
                          ['advisory'])
+    if sent:
+      self._in_flight += 1
+    return sent
+
+  def _StopIfIdle(self):
+    """Stop once all requests and ACK_TIMERs have been accounted for."""
+    if self._in_flight == 0 and self._outstanding_ack_timers == 0:
+      self._wrapper.Stop()
 
   def _AckTimerExpired(self):
     self._outstanding_ack_timers -= 1
+    # ACK_TIMER responses are followed up one at a time
     self._FetchQueuedMessage()
+    self._StopIfIdle()
 
   def _HandleResponse(self, response, unpacked_data, unpack_exception):
+    self._in_flight -= 1
     if not response.status.Succeeded():
       # this indicates a transport error
-      logging.error('Error: %s' % response.status.message)
-      if (self._outstanding_ack_timers == 0):
-        self._wrapper.Stop()
+      logging.error('Error: %s', response.status.message)
+      self._failed = True
+      self._StopIfIdle()
       return
 
     if response.response_code != OlaClient.RDM_COMPLETED_OK:
-      logging.error('Error: %s' % response.ResponseCodeAsString())
-      if (self._outstanding_ack_timers == 0):
-        self._wrapper.Stop()
+      logging.error('Error: %s', response.ResponseCodeAsString())
+      self._failed = True
+      self._StopIfIdle()
       return
 
     if response.response_type == OlaClient.RDM_ACK_TIMER:
-      logging.debug('Got ACK TIMER set to %d ms' % response.ack_timer)
+      logging.debug('Got ACK TIMER set to %d ms', response.ack_timer)
       self._wrapper.AddEvent(response.ack_timer, self._AckTimerExpired)
       self._outstanding_ack_timers += 1
       self._wrapper.Reset()
@@ -159,8 +223,7 @@ class QueuedMessageFetcher(object):
         response.nack_reason == RDMNack.NR_UNKNOWN_PID and
         response.command_class == OlaClient.RDM_GET_RESPONSE and
         response.pid == self._queued_message_pid.value):
-      if (self._outstanding_ack_timers == 0):
-        self._wrapper.Stop()
+      self._StopIfIdle()
       return
 
     # Stop if we get a message with no status messages in it.
@@ -169,16 +232,16 @@ class QueuedMessageFetcher(object):
         response.pid == self._status_messages_pid.value and
         unpacked_data is not None and
         unpacked_data.get('messages', []) == []):
-      if (self._outstanding_ack_timers == 0):
-        self._wrapper.Stop()
+      self._StopIfIdle()
       if response.queued_messages:
         logging.error(
-           'Got a empty status message but the queued message count is %d' %
+           'Got a empty status message but the queued message count is %d',
            response.queued_messages)
       return
 
     # more remain, keep fetching them
-    self._FetchQueuedMessage()
+    self._FillPipeline(response.queued_messages)
+    self._StopIfIdle()
 
 
 def GetTestClasses(module):
@@ -237,6 +300,10 @@ class TestRunner(object):
     # maps device properties to the tests that provide them
     self._property_map = {}
     self._all_tests = set()  # set of all test classes
+    # maps test classes to their DEPS, as a tuple
+    self._class_deps = {}
+    # maps id(test object) to the tuple returned by Requires()
+    self._requires_cache = {}
 
     # Used to flush the queued message queue
     self._message_fetcher = QueuedMessageFetcher(universe,
@@ -256,11 +323,13 @@ class TestRunner(object):
     Args:
       test: A child class of ResponderTest.
     """
-    for property in test_class.PROVIDES:
-      if property in self._property_map:
-        raise DuplicatePropertyException(
-            '%s is declared in more than one test' % property)
-      self._property_map[property] = test_class
+    provides = tuple(test_class.PROVIDES)
+    duplicates = set(provides).intersection(self._property_map)
+    if duplicates:
+      raise DuplicatePropertyException(
+          '%s is declared in more than one test' % sorted(duplicates)[0])
+    self._property_map.update(dict.fromkeys(provides, test_class))
+    self._class_deps[test_class] = tuple(test_class.DEPS)
     self._all_tests.add(test_class)
 
   def RunTests(self, whitelist=None, no_factory_defaults=False, update_cb=None):
@@ -290,7 +359,7 @@ class TestRunner(object):
           matched_tests.append(t.__name__)
       invalid_tests = whitelist.difference(matched_tests)
       for t in invalid_tests:
-        logging.error("Test %s doesn't exist, skipping" % t)
+        logging.error("Test %s doesn't exist, skipping", t)
 
     if no_factory_defaults:
       factory_default_tests = set(['ResetFactoryDefaults',
@@ -298,54 +367,83 @@ class TestRunner(object):
       tests_to_run = [test for test in tests_to_run
                       if test.__name__ not in factory_default_tests]
 
-    deps_map = self._InstantiateTests(device, tests_to_run)
-    tests = self._TopologicalSort(deps_map)
+    self._requires_cache = {}
+    reverse_deps, in_degree = self._InstantiateTests(device, tests_to_run)
+    tests = self._TopologicalSort(reverse_deps, in_degree)
 
-    logging.debug('Test order is %s' % tests)
     is_debug = logging.getLogger('').isEnabledFor(logging.DEBUG)
-
+    if is_debug:
+      logging.debug('Test order is %s', tests)
+
+    # check the properties directly to avoid going through __getattr__
+    properties = device._properties
+    # bind these once, rather than looking them up for every test
+    fetch_all_messages = self._message_fetcher.FetchAllMessages
+    requires_of = self._RequiresOf
+    inter_test_delay_s = self._inter_test_delay / 1000.0
+    num_tests = len(tests)
+    last_test = tests[-1] if tests else None
+    # True if a test has sent a SET since the queue was last flushed
+    state_modified = True
     tests_completed = 0
     for test in tests:
-      # make sure the queue is flushed before starting any tests
       if update_cb is not None:
-        update_cb(tests_completed, len(tests))
-      self._message_fetcher.FetchAllMessages()
+        update_cb(tests_completed, num_tests)
 
-      # capture the start time
-      start = datetime.datetime.now()
-      start_time_as_string = '%s ' % start.strftime('%d-%m-%Y %H:%M:%S.%f')
       start_header = ''
       end_header = ''
       if self._timestamp:
+        # capture the start time
+        start = datetime.datetime.now()
+        start_time_as_string = '%s ' % start.strftime('%d-%m-%Y %H:%M:%S.%f')
         if is_debug:
           start_header = start_time_as_string
         else:
           end_header = start_time_as_string
 
-      logging.debug('%s%s: %s' % (start_header, test, test.__doc__))
+      if is_debug:
+        logging.debug('%s%s: %s', start_header, test, test.__doc__)
 
       if test.state is TestState.BROKEN:
         test.LogDebug(' Test broken after init, skipping test.')
         continue
 
-      try:
-        for property in test.Requires():
-          getattr(device, property)
-      except AttributeError:
-        test.LogDebug(' Property: %s not found, skipping test.' % property)
+      # Each property is only set by the test that PROVIDES it, so this also
+      # skips everything downstream of a test that was skipped or didn't set
+      # its properties.
+      missing = [property for property in requires_of(test)
+                 if property not in properties]
+      if missing:
+        test.LogDebug(' Property: %s not found, skipping test.' % missing[0])
         tests_completed += 1
         continue
 
+      # make sure the queue is flushed before starting any tests. This is done
+      # after the checks above so skipped tests don't cost a round trip.
+      if test.FLUSH_QUEUE or state_modified:
+        fetch_all_messages()
+        state_modified = False
+
       test.Run()
+      if test.ModifiedState():
+        state_modified = True
 
       # Use inter_test_delay on all but the last test
-      if test != tests[-1]:
-        time.sleep(self._inter_test_delay / 1000.0)
+      if test is not last_test:
+        time.sleep(inter_test_delay_s)
 
-      logging.info('%s%s: %s' % (end_header, test, test.state.ColorString()))
+      logging.info('%s%s: %s', end_header, test, test.state.ColorString())
       tests_completed += 1
     return tests, device
 
+  def _RequiresOf(self, test_obj):
+    """Return the properties a test object requires, calling Requires() once."""
+    requires = self._requires_cache.get(id(test_obj))
+    if requires is None:
+      requires = tuple(test_obj.Requires())
+      self._requires_cache[id(test_obj)] = requires
+    return requires
+
   def _InstantiateTests(self, device, tests_to_run):
     """Instantiate the required tests and calculate the dependencies.
 
@@ -354,26 +452,38 @@ class TestRunner(object):
       tests_to_run: The list of test class names to run
 
     Returns:
-      A dict mapping each test object to the set of test objects it depends on.
+      A tuple in the form (reverse_deps, in_degree), where reverse_deps maps
+      each test object to the list of test objects that depend on it, and
+      in_degree maps each test object to the number of tests it depends on.
     """
     class_name_to_object = {}
     deps_map = {}
     for test_class in tests_to_run:
       self._AddTest(device, class_name_to_object, deps_map, test_class)
-    return deps_map
 
-  def _AddTest(self, device, class_name_to_object, deps_map, test_class,
-               parents=[]):
-    """Add a test class, recursively adding all REQUIRES.
+    reverse_deps = {}
+    in_degree = {}
+    for test in deps_map:
+      reverse_deps[test] = []
+    for test, deps in deps_map.items():
+      in_degree[test] = len(deps)
+      for dep in deps:
+        reverse_deps[dep].append(test)
+    return reverse_deps, in_degree
+
+  def _AddTest(self, device, class_name_to_object, deps_map, test_class):
+    """Add a test class, and all the tests it REQUIRES or DEPS on.
        This also checks for circular dependencies.
 
+    The dependencies are walked with an explicit stack rather than recursion,
+    so long dependency chains don't hit the recursion limit.
+
     Args:
       device: A DeviceProperties object which is passed to each test.
       class_name_to_object: A dict of class names to objects.
       deps_map: A dict mapping each test object to the set of test objects it
         depends on.
       test_class: A class which sub classes ResponderTest.
-      parents: The parents for the current class.
 
     Returns:
       An instance of the test class.
@@ -381,7 +491,46 @@ class TestRunner(object):
     if test_class in class_name_to_object:
       return class_name_to_object[test_class]
 
-    class_name_to_object[test_class] = None
+    # Each entry is (test_class, test_obj, dep_classes, iterator over
+    # dep_classes). in_progress holds the classes that are on the stack.
+    stack = []
+    in_progress = set()
+
+    def Push(new_class):
+      test_obj, dep_classes = self._CreateTest(device, new_class)
+      stack.append((new_class, test_obj, dep_classes, iter(dep_classes)))
+      in_progress.add(new_class)
+
+    Push(test_class)
+    while stack:
+      current_class, test_obj, dep_classes, dep_iter = stack[-1]
+      for dep_class in dep_iter:
+        if dep_class in in_progress:
+          raise CircularDependencyException(
+              'Circular dependency found %s in %s' %
+              (dep_class, [entry[0] for entry in stack]))
+        if dep_class not in class_name_to_object:
+          Push(dep_class)
+          break
+      else:
+        # all the deps for this test have been added
+        stack.pop()
+        in_progress.discard(current_class)
+        class_name_to_object[current_class] = test_obj
+        deps_map[test_obj] = set(
+            class_name_to_object[dep_class] for dep_class in dep_classes)
+    return class_name_to_object[test_class]
+
+  def _CreateTest(self, device, test_class):
+    """Instantiate a test class and work out which classes it depends on.
+
+    Args:
+      device: A DeviceProperties object which is passed to the test.
+      test_class: A class which sub classes ResponderTest.
+
+    Returns:
+      A tuple in the form (test_obj, dep_classes).
+    """
     test_obj = test_class(device,
                           self._universe,
                           self._uid,
@@ -391,56 +540,49 @@ class TestRunner(object):
                           self._broadcast_write_delay,
                           self._timing_stats)
 
-    new_parents = parents + [test_class]
+    property_map = self._property_map
     dep_classes = []
-    for property in test_obj.Requires():
-      if property not in self._property_map:
+    for property in self._RequiresOf(test_obj):
+      dep_class = property_map.get(property)
+      if dep_class is None:
         raise MissingPropertyException(
             '%s not listed in any PROVIDES list.' % property)
-      dep_classes.append(self._property_map[property])
-    dep_classes.extend(test_class.DEPS)
-
-    dep_objects = []
-    for dep_class in dep_classes:
-      if dep_class in new_parents:
-        raise CircularDependencyException(
-            'Circular dependency found %s in %s' % (dep_class, new_parents))
-      obj = self._AddTest(device,
-                          class_name_to_object,
-                          deps_map,
-                          dep_class,
-                          new_parents)
-      dep_objects.append(obj)
-
-    class_name_to_object[test_class] = test_obj
-    deps_map[test_obj] = set(dep_objects)
-    return test_obj
-
-  def _TopologicalSort(self, deps_dict):
+      dep_classes.append(dep_class)
+    deps = self._class_deps.get(test_class)
+    if deps is None:
+      # this class was only reached through another test's DEPS
+      deps = test_class.DEPS
+    dep_classes.extend(deps)
+    return test_obj, dep_classes
+
+  def _TopologicalSort(self, reverse_deps, in_degree):
     """Sort the tests according to the dep ordering.
 
     Args:
-      A dict in the form test_name: [deps].
+      reverse_deps: A dict in the form test: [tests that depend on test].
+      in_degree: A dict in the form test: number of deps. This is consumed
+        by the sort.
+
+    Returns:
+      The list of tests, in the order they should be run.
     """
     # The final order to run tests in
     tests = []
 
-    remaining_tests = [
-        test for test, deps in deps_dict.iteritems() if len(deps)]
-    no_deps = set(
-        test for test, deps in deps_dict.iteritems() if len(deps) == 0)
+    ready = collections.deque(
+        test for test, count in in_degree.items() if count == 0)
 
-    while len(no_deps) > 0:
-      current_test = no_deps.pop()
+    while ready:
+      current_test = ready.popleft()
       tests.append(current_test)
 
-      remove_list = []
-      for test in remaining_tests:
-        deps_dict[test].discard(current_test)
-        if len(deps_dict[test]) == 0:
-          no_deps.add(test)
-          remove_list.append(test)
+      for test in reverse_deps[current_test]:
+        in_degree[test] -= 1
+        if in_degree[test] == 0:
+          ready.append(test)
 
-      for test in remove_list:
-        remaining_tests.remove(test)
+    if len(tests) != len(in_degree):
+      raise CircularDependencyException(
+          'Circular dependency found in %s' %
+          [test for test, count in in_degree.items() if count])
     return tests
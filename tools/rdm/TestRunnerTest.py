@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# TestRunnerTest.py
+# Copyright (C) 2026 Open Lighting Project
+
+import os
+import unittest
+from ResponderTest import TestFixture
+from TestRunner import (CircularDependencyException, MissingPropertyException,
+                        QueuedMessageFetcher, TestRunner)
+from TestState import TestState
+from ola import PidStore
+from ola.OlaClient import OlaClient, RDMNack
+
+"""Test cases for the TestRunner."""
+
+global pid_store_path
+
+
+class MockWrapper(object):
+  """A ClientWrapper that never sends anything."""
+  def Client(self):
+    return None
+
+
+class MockFetcher(object):
+  """Stands in for the QueuedMessageFetcher and counts the flushes."""
+  def __init__(self):
+    self.flushes = 0
+
+  def FetchAllMessages(self):
+    self.flushes += 1
+
+
+class MockStatus(object):
+  def __init__(self, succeeded):
+    self._succeeded = succeeded
+    self.message = 'transport error'
+
+  def Succeeded(self):
+    return self._succeeded
+
+
+class MockResponse(object):
+  """A response to a Get QUEUED_MESSAGE."""
+  def __init__(self, pid, response_type=OlaClient.RDM_ACK, queued_messages=0,
+               succeeded=True, nack_reason=None, ack_timer=0):
+    self.status = MockStatus(succeeded)
+    self.response_code = OlaClient.RDM_COMPLETED_OK
+    self.response_type = response_type
+    self.command_class = OlaClient.RDM_GET_RESPONSE
+    self.pid = pid
+    self.queued_messages = queued_messages
+    self.nack_reason = nack_reason
+    self.ack_timer = ack_timer
+
+
+class MockEventWrapper(object):
+  """A ClientWrapper which runs the queued responses and timers in order."""
+  def __init__(self, test_case):
+    self._test_case = test_case
+    self._quit = False
+    self.responses = []
+    self.events = []
+    self.stop_count = 0
+
+  def Run(self):
+    self._quit = False
+    while not self._quit:
+      if self.responses:
+        self.responses.pop(0)()
+      elif self.events:
+        self.events.pop(0)()
+      else:
+        self._test_case.fail('Wrapper would block forever')
+
+  def Stop(self):
+    self._quit = True
+    self.stop_count += 1
+
+  def Reset(self):
+    self._quit = False
+
+  def AddEvent(self, delay, callback):
+    self.events.append(callback)
+
+
+class MockResponder(object):
+  """An RDMAPI that answers Get QUEUED_MESSAGE from a list of replies.
+
+  Each reply is one of 'message', 'error', 'nack' or 'timer'. Once the list is
+  empty, an empty STATUS_MESSAGES is returned.
+  """
+  def __init__(self, wrapper, replies):
+    self._wrapper = wrapper
+    self._replies = list(replies)
+    self.gets = 0
+    self.in_flight = 0
+    self.max_in_flight = 0
+
+  def Get(self, universe, uid, sub_device, pid, callback, args=[]):
+    self.gets += 1
+    self.in_flight += 1
+    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    self._wrapper.responses.append(lambda: self._Respond(callback))
+    return True
+
+  def _Respond(self, callback):
+    self.in_flight -= 1
+    status_pid = PidStore.GetStore().GetName('STATUS_MESSAGES').value
+    queued_pid = PidStore.GetStore().GetName('QUEUED_MESSAGE').value
+    reply = self._replies.pop(0) if self._replies else None
+    remaining = len([r for r in self._replies if r == 'message'])
+    if reply is None:
+      callback(MockResponse(status_pid), {'messages': []}, None)
+    elif reply == 'message':
+      # any PID other than STATUS_MESSAGES
+      callback(MockResponse(queued_pid + 1, queued_messages=remaining), {},
+               None)
+    elif reply == 'error':
+      callback(MockResponse(queued_pid, succeeded=False), None, None)
+    elif reply == 'nack':
+      callback(MockResponse(queued_pid,
+                            response_type=OlaClient.RDM_NACK_REASON,
+                            nack_reason=RDMNack.NR_UNKNOWN_PID),
+               None, None)
+    elif reply == 'timer':
+      callback(MockResponse(queued_pid,
+                            response_type=OlaClient.RDM_ACK_TIMER,
+                            ack_timer=10),
+               None, None)
+
+
+class RunnableTestFixture(TestFixture):
+  """A test which doesn't send anything, and sets all its properties."""
+  def PidRequired(self):
+    return False
+
+  def Test(self):
+    for property in self.PROVIDES:
+      self.SetProperty(property, True)
+    self.SetPassed()
+
+
+class FlushDefault(RunnableTestFixture):
+  pass
+
+
+class FlushGet(RunnableTestFixture):
+  FLUSH_QUEUE = False
+  DEPS = [FlushDefault]
+
+
+class FlushSet(RunnableTestFixture):
+  FLUSH_QUEUE = False
+  DEPS = [FlushGet]
+
+  def ModifiedState(self):
+    return True
+
+
+class FlushGetAfterSet(RunnableTestFixture):
+  FLUSH_QUEUE = False
+  DEPS = [FlushSet]
+
+
+class FlushSecondGet(RunnableTestFixture):
+  FLUSH_QUEUE = False
+  DEPS = [FlushGetAfterSet]
+
+
+class FlushProvidesNothing(RunnableTestFixture):
+  """Declares a property but never sets it."""
+  FLUSH_QUEUE = False
+  DEPS = [FlushSecondGet]
+  PROVIDES = ['never_set']
+
+  def Test(self):
+    self.SetPassed()
+
+
+class FlushSkipped(RunnableTestFixture):
+  REQUIRES = ['never_set']
+
+
+class ProvidesA(RunnableTestFixture):
+  PROVIDES = ['a']
+
+
+class ProvidesB(RunnableTestFixture):
+  REQUIRES = ['a']
+  PROVIDES = ['b']
+
+
+class RequiresAB(RunnableTestFixture):
+  REQUIRES = ['a', 'b']
+
+
+class DependsOnA(RunnableTestFixture):
+  DEPS = [ProvidesA]
+
+
+class NoDeps(RunnableTestFixture):
+  pass
+
+
+class CycleX(RunnableTestFixture):
+  REQUIRES = ['y']
+  PROVIDES = ['x']
+
+
+class CycleY(RunnableTestFixture):
+  REQUIRES = ['x']
+  PROVIDES = ['y']
+
+
+class RequiresItself(RunnableTestFixture):
+  REQUIRES = ['self']
+  PROVIDES = ['self']
+
+
+class RequiresMissing(RunnableTestFixture):
+  REQUIRES = ['missing']
+
+
+class NotRegistered(RunnableTestFixture):
+  pass
+
+
+class DependsOnNotRegistered(RunnableTestFixture):
+  DEPS = [NotRegistered]
+
+
+class TestRunnerTest(unittest.TestCase):
+  def _CreateRunner(self, test_classes):
+    runner = TestRunner(1, None, 0, 0, PidStore.GetStore(pid_store_path),
+                        MockWrapper())
+    for test_class in test_classes:
+      runner.RegisterTest(test_class)
+    runner._message_fetcher = MockFetcher()
+    return runner
+
+  def _TestNames(self, tests):
+    return [test.__class__.__name__ for test in tests]
+
+  def testOrder(self):
+    runner = self._CreateRunner(
+        [RequiresAB, DependsOnA, ProvidesB, NoDeps, ProvidesA])
+    tests, device = runner.RunTests()
+
+    names = self._TestNames(tests)
+    self.assertEqual(
+        ['DependsOnA', 'NoDeps', 'ProvidesA', 'ProvidesB', 'RequiresAB'],
+        sorted(names))
+    for earlier, later in [('ProvidesA', 'ProvidesB'),
+                           ('ProvidesA', 'RequiresAB'),
+                           ('ProvidesB', 'RequiresAB'),
+                           ('ProvidesA', 'DependsOnA')]:
+      self.assertTrue(names.index(earlier) < names.index(later))
+    self.assertEqual({'a': True, 'b': True}, device.AsDict())
+
+  def testWhitelistAddsDependencies(self):
+    runner = self._CreateRunner(
+        [RequiresAB, DependsOnA, ProvidesB, NoDeps, ProvidesA])
+    tests, device = runner.RunTests(whitelist=set(['RequiresAB']))
+    self.assertEqual(['ProvidesA', 'ProvidesB', 'RequiresAB'],
+                     self._TestNames(tests))
+
+  def testCircularDependency(self):
+    runner = self._CreateRunner([CycleX, CycleY])
+    self.assertRaises(CircularDependencyException, runner.RunTests)
+
+  def testSelfDependency(self):
+    runner = self._CreateRunner([RequiresItself])
+    self.assertRaises(CircularDependencyException, runner.RunTests)
+
+  def testUnregisteredDeps(self):
+    runner = self._CreateRunner([DependsOnNotRegistered])
+    tests, device = runner.RunTests()
+    self.assertEqual(['NotRegistered', 'DependsOnNotRegistered'],
+                     self._TestNames(tests))
+
+  def testDeepDependencyChain(self):
+    # deeper than the default recursion limit
+    depth = 3000
+    chain = [type('Chain0', (RunnableTestFixture,), {})]
+    for i in range(1, depth):
+      chain.append(type('Chain%d' % i, (RunnableTestFixture,),
+                        {'DEPS': [chain[-1]]}))
+
+    runner = self._CreateRunner([chain[-1]])
+    tests, device = runner.RunTests()
+    self.assertEqual(['Chain%d' % i for i in range(depth)],
+                     self._TestNames(tests))
+
+  def testFlushQueue(self):
+    runner = self._CreateRunner(
+        [FlushDefault, FlushGet, FlushSet, FlushGetAfterSet, FlushSecondGet,
+         FlushProvidesNothing, FlushSkipped])
+    tests, device = runner.RunTests()
+    self.assertEqual(
+        ['FlushDefault', 'FlushGet', 'FlushSet', 'FlushGetAfterSet',
+         'FlushSecondGet', 'FlushProvidesNothing', 'FlushSkipped'],
+        self._TestNames(tests))
+    # Flushed before FlushDefault, and before FlushGetAfterSet because of the
+    # SET. FlushSkipped would flush but is skipped first.
+    self.assertEqual(2, runner._message_fetcher.flushes)
+    self.assertEqual(TestState.NOT_RUN, tests[-1].state)
+
+  def testMissingProperty(self):
+    runner = self._CreateRunner([ProvidesA, RequiresMissing])
+    self.assertRaises(MissingPropertyException, runner.RunTests)
+
+
+class QueuedMessageFetcherTest(unittest.TestCase):
+  def _Fetch(self, replies, limit=25):
+    PidStore.GetStore(pid_store_path)
+    wrapper = MockEventWrapper(self)
+    responder = MockResponder(wrapper, replies)
+    fetcher = QueuedMessageFetcher(1, None, responder, wrapper, limit=limit)
+    fetcher.FetchAllMessages()
+    # nothing should be left outstanding
+    self.assertEqual(0, responder.in_flight)
+    self.assertEqual([], wrapper.responses)
+    self.assertEqual([], wrapper.events)
+    self.assertEqual(1, wrapper.stop_count)
+    return responder
+
+  def testEmptyQueue(self):
+    responder = self._Fetch([])
+    self.assertEqual(1, responder.gets)
+
+  def testUnknownPid(self):
+    responder = self._Fetch(['nack'])
+    self.assertEqual(1, responder.gets)
+
+  def testTransportError(self):
+    responder = self._Fetch(['error'])
+    self.assertEqual(1, responder.gets)
+
+  def testQueuedMessages(self):
+    responder = self._Fetch(['message'] * 3)
+    # one per message, and one for the empty status message
+    self.assertEqual(4, responder.gets)
+    self.assertEqual(2, responder.max_in_flight)
+
+  def testPipelineDepth(self):
+    responder = self._Fetch(['message'] * 10)
+    self.assertEqual(11, responder.gets)
+    self.assertEqual(4, responder.max_in_flight)
+
+  def testErrorStopsRefilling(self):
+    # the first response says 3 more are waiting, so 3 are sent together
+    responder = self._Fetch(['message', 'error', 'message', 'message',
+                             'message'])
+    self.assertEqual(4, responder.gets)
+
+  def testAckTimer(self):
+    responder = self._Fetch(['timer', 'message'])
+    # the timer, the follow up Get, and the empty status message
+    self.assertEqual(3, responder.gets)
+    self.assertEqual(1, responder.max_in_flight)
+
+  def testLoopLimit(self):
+    responder = self._Fetch(['message'] * 50, limit=25)
+    self.assertEqual(25, responder.gets)
+
+
+if __name__ == '__main__':
+  pid_store_path = (os.environ.get('PIDSTOREDIR', "../../data/rdm"))
+  unittest.main()